@@ -4,17 +4,38 @@ Gerador de gráficos para proposta
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Backend não-interativo
-from typing import List
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+from typing import List, Optional
 from app.models import GeracaoMensal, PaybackAnual
 import io
 
 # Configurações de estilo
 plt.style.use('seaborn-v0_8-darkgrid')
 
+# Os gráficos usam Figure diretamente (sem o estado global do pyplot),
+# o que permite renderizá-los em threads concorrentes.
 
-def gerar_grafico_geracao_mensal(geracao_mensal: List[GeracaoMensal]) -> bytes:
+
+def _salvar_figura(fig: Figure, dpi: int, formato: str, qualidade: Optional[int]) -> bytes:
+    """Salva a figura em bytes no formato (png/jpeg), DPI e qualidade JPEG indicados"""
+    buf = io.BytesIO()
+    pil_kwargs = {'quality': qualidade, 'optimize': True} if formato == 'jpeg' and qualidade else None
+    fig.savefig(buf, format=formato, dpi=dpi, bbox_inches='tight', pil_kwargs=pil_kwargs)
+    buf.seek(0)
+    
+    return buf.read()
+
+
+def gerar_grafico_geracao_mensal(
+    geracao_mensal: List[GeracaoMensal],
+    dpi: int = 150,
+    formato: str = 'png',
+    qualidade: Optional[int] = None
+) -> bytes:
     """Gera gráfico de barras da geração mensal"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
     
     meses = [g.nome_mes[:3] for g in geracao_mensal]  # Abrevia nomes
     valores = [g.geracao for g in geracao_mensal]
@@ -36,20 +57,21 @@ def gerar_grafico_geracao_mensal(geracao_mensal: List[GeracaoMensal]) -> bytes:
     ax.set_title('PRODUÇÃO DE ENERGIA', fontsize=14, fontweight='bold', pad=20)
     ax.grid(axis='y', alpha=0.3)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salva em bytes
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-    buf.seek(0)
-    plt.close(fig)
-    
-    return buf.read()
+    return _salvar_figura(fig, dpi, formato, qualidade)
 
 
-def gerar_grafico_payback(payback: List[PaybackAnual]) -> bytes:
+def gerar_grafico_payback(
+    payback: List[PaybackAnual],
+    dpi: int = 150,
+    formato: str = 'png',
+    qualidade: Optional[int] = None
+) -> bytes:
     """Gera gráfico de linha do payback (saldo acumulado)"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
     
     anos = [p.ano for p in payback]
     saldos = [p.saldo for p in payback]
@@ -74,13 +96,8 @@ def gerar_grafico_payback(payback: List[PaybackAnual]) -> bytes:
     ax.legend(loc='best')
     
     # Formata eixo Y como moeda
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'R$ {x:,.0f}'))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'R$ {x:,.0f}'))
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-    buf.seek(0)
-    plt.close(fig)
-    
-    return buf.read()
+    return _salvar_figura(fig, dpi, formato, qualidade)
@@ -0,0 +1,263 @@
+"""
+Geração de propostas em lote (linha de comando)
+
+Lê ProposalInput de um arquivo CSV ou JSONL e gera os PDFs em paralelo,
+gravando o progresso em um checkpoint para retomar execuções interrompidas.
+
+Uso:
+    python -m app.lote propostas.csv --saida lote/ --processos 8 --perfil mobile
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, Iterator, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.models import ProposalInput
+from app.perfis import PERFIS, PERFIL_PADRAO
+from app.proposta import calcular_proposta, chave_proposta, gerar_arquivos_proposta
+
+CHECKPOINT_FILENAME = "checkpoint.jsonl"
+
+# Tarefas por processo antes de reciclá-lo (limita o crescimento de memória)
+TAREFAS_POR_PROCESSO = 200
+
+# Intervalo entre atualizações das estatísticas (segundos)
+INTERVALO_STATS = 2.0
+
+
+def ler_propostas(path: Path, perfil: str) -> Iterator[Tuple[int, str, Union[ProposalInput, str]]]:
+    """
+    Lê e valida as linhas do arquivo de entrada sob demanda
+    
+    Args:
+        path: Arquivo CSV ou JSONL
+        perfil: Perfil de saída para linhas sem o campo 'perfil'
+    
+    Returns:
+        Iterador de (número da linha, chave, ProposalInput ou mensagem de erro).
+        A chave das linhas válidas é a da proposta; a das inválidas é o hash
+        do conteúdo bruto da linha.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix.lower() == '.csv':
+            # Células vazias usam o valor padrão do campo; line_num conta o cabeçalho
+            reader = csv.DictReader(f)
+            linhas = (
+                (reader.line_num, {k: v for k, v in row.items() if v not in ('', None)})
+                for row in reader
+            )
+        else:
+            linhas = ((linha, texto) for linha, texto in enumerate(f, start=1) if texto.strip())
+        
+        for linha, dados in linhas:
+            if isinstance(dados, str):
+                bruto = dados.strip()
+            else:
+                # Células além do cabeçalho ficam na chave None do DictReader
+                bruto = json.dumps({str(k): v for k, v in dados.items()}, sort_keys=True, ensure_ascii=False)
+            chave_invalida = hashlib.sha256(f"{perfil}:{bruto}".encode()).hexdigest()[:32]
+            
+            if not isinstance(dados, str) and None in dados:
+                yield linha, chave_invalida, "Linha com mais colunas que o cabeçalho"
+                continue
+            
+            try:
+                if isinstance(dados, str):
+                    dados = json.loads(dados)
+                data = ProposalInput(**{"perfil": perfil, **dados})
+            except json.JSONDecodeError as e:
+                yield linha, chave_invalida, f"JSON inválido: {e}"
+            except (ValidationError, TypeError) as e:
+                yield linha, chave_invalida, str(e)
+            else:
+                yield linha, chave_proposta(data, PERFIS[data.perfil]), data
+
+
+def ler_checkpoint(path: Path) -> Dict[str, str]:
+    """
+    Retorna as chaves das linhas já resolvidas em execuções anteriores e seu status
+    
+    Inclui as propostas geradas com sucesso e as linhas inválidas (que
+    falhariam de novo); erros de geração não entram e são refeitos. A chave
+    depende do conteúdo da linha e do perfil (não da posição no arquivo),
+    então a retomada funciona mesmo se a entrada for reordenada ou receber
+    novas linhas.
+    """
+    concluidas = {}
+    if not path.exists():
+        return concluidas
+    
+    with open(path, encoding='utf-8') as f:
+        for texto in f:
+            try:
+                registro = json.loads(texto)
+            except json.JSONDecodeError:
+                # Última linha incompleta de uma execução interrompida
+                continue
+            if registro.get("status") in ("ok", "invalida") and "chave" in registro:
+                concluidas[registro["chave"]] = registro["status"]
+    
+    return concluidas
+
+
+def gerar_linha(linha: int, data: ProposalInput, proposal_id: str, saida: str) -> dict:
+    """Gera a proposta de uma linha no processo worker"""
+    calculos = calcular_proposta(data)
+    
+    # Subdiretórios pelo prefixo do id para não concentrar milhares de arquivos
+    output_dir = Path(saida) / proposal_id[:2]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    pdf_path = gerar_arquivos_proposta(
+        data=data,
+        calculos=calculos,
+        proposal_id=proposal_id,
+        output_dir=output_dir,
+        perfil=PERFIS[data.perfil],
+        # Em lote só o PDF interessa; os gráficos dobrariam o uso de disco
+        manter_graficos=False
+    )
+    
+    return {
+        "linha": linha,
+        "chave": proposal_id,
+        "status": "ok",
+        "pdf": str(pdf_path.relative_to(saida)),
+        "tamanho_bytes": pdf_path.stat().st_size
+    }
+
+
+class Estatisticas:
+    """Contadores de progresso com taxa de geração"""
+    
+    def __init__(self):
+        self.inicio = time.monotonic()
+        self.ultimo_print = 0.0
+        self.geradas = 0
+        self.erros = 0
+        self.invalidas = 0
+        self.retomadas = 0
+        self.duplicadas = 0
+        self.bytes = 0
+    
+    def linha(self) -> str:
+        decorrido = time.monotonic() - self.inicio
+        taxa = self.geradas / decorrido if decorrido else 0
+        return (f"{self.geradas} geradas | {self.erros} erros | {self.invalidas} inválidas | "
+                f"{self.retomadas} retomadas | "
+                f"{self.duplicadas} duplicadas | "
+                f"{taxa:.1f} propostas/s | {self.bytes / 1024 / 1024:.1f} MB | {decorrido:.0f}s")
+    
+    def imprimir(self, forcar: bool = False):
+        agora = time.monotonic()
+        if forcar or agora - self.ultimo_print >= INTERVALO_STATS:
+            self.ultimo_print = agora
+            print(f"\r{self.linha()}", end='', file=sys.stderr, flush=True)
+
+
+def executar_lote(entrada: Path, saida: Path, processos: int, perfil: str) -> Estatisticas:
+    """
+    Gera as propostas do arquivo de entrada, retomando do checkpoint
+    
+    Args:
+        entrada: Arquivo CSV ou JSONL com os dados das propostas
+        saida: Diretório de saída (PDFs em subdiretórios e checkpoint)
+        processos: Quantidade de processos de renderização
+        perfil: Perfil de saída padrão para linhas sem o campo 'perfil'
+    
+    Returns:
+        Estatísticas da execução
+    """
+    saida.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = saida / CHECKPOINT_FILENAME
+    concluidas = ler_checkpoint(checkpoint_path)
+    stats = Estatisticas()
+    
+    # Limite de tarefas em andamento: a entrada é lida conforme há vaga no pool
+    max_pendentes = processos * 2
+    
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+            ProcessPoolExecutor(max_workers=processos, max_tasks_per_child=TAREFAS_POR_PROCESSO) as executor:
+        
+        def registrar(registro: dict):
+            checkpoint.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            if registro["status"] == "ok":
+                stats.geradas += 1
+                stats.bytes += registro["tamanho_bytes"]
+            elif registro["status"] == "invalida":
+                stats.invalidas += 1
+            else:
+                stats.erros += 1
+        
+        def coletar(pendentes: dict) -> dict:
+            """Aguarda ao menos uma tarefa, registra as concluídas e retorna as pendentes"""
+            prontos, restantes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                linha, chave = pendentes[futuro]
+                try:
+                    registrar(futuro.result())
+                except Exception as e:
+                    registrar({"linha": linha, "chave": chave, "status": "erro", "erro": str(e)})
+            stats.imprimir()
+            return {f: pendentes[f] for f in restantes}
+        
+        pendentes = {}
+        # Chaves já enviadas nesta execução: linhas repetidas geram o mesmo PDF
+        vistas = set()
+        for linha, chave, data in ler_propostas(entrada, perfil):
+            if chave in concluidas:
+                # Linhas inválidas continuam contando, para o código de saída
+                # não depender de ser a primeira execução ou uma retomada
+                if concluidas[chave] == "invalida":
+                    stats.invalidas += 1
+                else:
+                    stats.retomadas += 1
+                continue
+            
+            if chave in vistas:
+                stats.duplicadas += 1
+                continue
+            vistas.add(chave)
+            
+            if isinstance(data, str):
+                registrar({"linha": linha, "chave": chave, "status": "invalida", "erro": data})
+                continue
+            
+            futuro = executor.submit(gerar_linha, linha, data, chave, str(saida))
+            pendentes[futuro] = (linha, chave)
+            if len(pendentes) >= max_pendentes:
+                pendentes = coletar(pendentes)
+        
+        while pendentes:
+            pendentes = coletar(pendentes)
+    
+    stats.imprimir(forcar=True)
+    print(file=sys.stderr)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geração de propostas em lote")
+    parser.add_argument("entrada", type=Path, help="Arquivo CSV ou JSONL com os dados das propostas")
+    parser.add_argument("--saida", type=Path, default=Path("lote"), help="Diretório de saída (padrão: lote)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1, help="Processos de renderização")
+    parser.add_argument("--perfil", choices=list(PERFIS), default=PERFIL_PADRAO,
+                        help="Perfil de saída para linhas sem o campo 'perfil'")
+    args = parser.parse_args()
+    
+    stats = executar_lote(args.entrada, args.saida, args.processos, args.perfil)
+    # 1 se houver falhas de geração ou linhas inválidas na entrada (em qualquer execução)
+    sys.exit(1 if stats.erros or stats.invalidas else 0)
+
+
+if __name__ == "__main__":
+    main()
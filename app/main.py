@@ -6,19 +6,12 @@ from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import os
-import uuid
 from datetime import datetime
 from pathlib import Path
 
-from app.models import ProposalInput, ProposalOutput, Calculos
-from app.calculos import (
-    calcular_potencia_instalada,
-    calcular_geracao_mensal,
-    calcular_geracao_anual,
-    calcular_payback
-)
-from app.graficos import gerar_grafico_geracao_mensal, gerar_grafico_payback
-from app.pdf_generator import gerar_pdf
+from app.models import ProposalInput, ProposalOutput
+from app.perfis import PERFIS
+from app.proposta import calcular_proposta, chave_proposta, gerar_arquivos_proposta
 
 app = FastAPI(
     title="Solar Proposal API",
@@ -68,56 +61,25 @@ async def generate_proposal(data: ProposalInput):
     """
     try:
         # 1. Cálculos
-        quantidade_placas = data.quantidade_placas
-        potencia_instalada = calcular_potencia_instalada(quantidade_placas)
-        geracao_mensal = calcular_geracao_mensal(quantidade_placas)
-        geracao_anual = calcular_geracao_anual(geracao_mensal)
-        investimento_total = data.valor_kit + data.valor_mao_obra
-        
-        payback_list, ano_retorno, economia_25_anos = calcular_payback(
-            geracao_anual, investimento_total
-        )
-        
-        calculos = Calculos(
-            quantidade_placas=quantidade_placas,
-            potencia_instalada=potencia_instalada,
-            geracao_mensal=geracao_mensal,
-            geracao_anual=geracao_anual,
-            investimento_total=investimento_total,
-            payback=payback_list,
-            ano_retorno=ano_retorno,
-            economia_25_anos=economia_25_anos
-        )
-        
-        # 2. Gerar gráficos
-        proposal_id = str(uuid.uuid4())
-        
-        grafico_geracao_bytes = gerar_grafico_geracao_mensal(geracao_mensal)
-        grafico_geracao_path = OUTPUT_DIR / f"{proposal_id}_geracao.png"
-        with open(grafico_geracao_path, 'wb') as f:
-            f.write(grafico_geracao_bytes)
-        
-        grafico_payback_bytes = gerar_grafico_payback(payback_list)
-        grafico_payback_path = OUTPUT_DIR / f"{proposal_id}_payback.png"
-        with open(grafico_payback_path, 'wb') as f:
-            f.write(grafico_payback_bytes)
-        
-        # 3. Gerar PDF
-        pdf_filename = f"{proposal_id}_proposta.pdf"
-        pdf_path = OUTPUT_DIR / pdf_filename
+        calculos = calcular_proposta(data)
         
-        gerar_pdf(
-            input_data=data,
+        # 2. Gerar gráficos e PDF no perfil de saída (reaproveita o cache do perfil)
+        perfil = PERFIS[data.perfil]
+        proposal_id = chave_proposta(data, perfil)
+        pdf_path = gerar_arquivos_proposta(
+            data=data,
             calculos=calculos,
-            grafico_geracao_path=str(grafico_geracao_path),
-            grafico_payback_path=str(grafico_payback_path),
-            output_path=str(pdf_path)
+            proposal_id=proposal_id,
+            output_dir=OUTPUT_DIR,
+            perfil=perfil
         )
         
-        # 4. Retornar resultado
+        # 3. Retornar resultado
         return ProposalOutput(
-            pdf_path=f"/outputs/{pdf_filename}",
+            pdf_path=f"/outputs/{pdf_path.name}",
             web_url=f"/proposal/{proposal_id}",
+            perfil=data.perfil,
+            tamanho_bytes=pdf_path.stat().st_size,
             calculos=calculos
         )
         
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 
+from app.perfis import PERFIS, PERFIL_PADRAO
+
 
 class ProposalInput(BaseModel):
     cliente: str = Field(..., description="Nome do cliente")
@@ -9,6 +11,14 @@ class ProposalInput(BaseModel):
     valor_kit: float = Field(..., description="Valor do kit fotovoltaico em R$", gt=0)
     valor_mao_obra: float = Field(..., description="Valor da mão de obra em R$", gt=0)
     tipo_inversor: str = Field(..., description="Descrição do inversor")
+    perfil: str = Field(PERFIL_PADRAO, description=f"Perfil de saída do PDF ({', '.join(PERFIS)})")
+    
+    @field_validator("perfil")
+    @classmethod
+    def validar_perfil(cls, v: str) -> str:
+        if v not in PERFIS:
+            raise ValueError(f"perfil deve ser um de: {', '.join(PERFIS)}")
+        return v
 
 
 class GeracaoMensal(BaseModel):
@@ -38,4 +48,6 @@ class Calculos(BaseModel):
 class ProposalOutput(BaseModel):
     pdf_path: str
     web_url: str
+    perfil: str
+    tamanho_bytes: int
     calculos: Calculos
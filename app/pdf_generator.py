@@ -1,14 +1,17 @@
 """
 Gerador de PDF de proposta comercial
 """
+from reportlab import rl_config
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image, Flowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 from reportlab.pdfgen import canvas
-from typing import List
+from concurrent.futures import Future
+from functools import partial
+from typing import List, Optional, Union
 import os
 from datetime import datetime
 
@@ -72,21 +75,88 @@ realizamos a simulação do valor do seguro no momento do fechamento do projeto
 finalizamos o processo diretamente com a seguradora."""
 
 
+# Streams binários (sem ASCII85): imagens e páginas ficam ~20% menores.
+# Configuração global do ReportLab, vale para todos os perfis e todo o processo.
+rl_config.useA85 = 0
+
+# Tamanho dos gráficos na página
+GRAFICO_LARGURA = 170*mm
+GRAFICO_ALTURA = 85*mm
+
+
+class _GraficoPendente(Flowable):
+    """
+    Gráfico ainda em renderização (Future que resolve para o caminho da imagem).
+    
+    Ocupa o tamanho fixo do gráfico durante o layout e, ao desenhar a página,
+    apenas referencia um form XObject que só é definido em _CanvasGraficos.save.
+    Assim todas as páginas são montadas sem aguardar os gráficos.
+    """
+    
+    def __init__(self, futuro: Future, nome: str, width: float, height: float):
+        super().__init__()
+        self.futuro = futuro
+        self.nome = nome
+        self.width = width
+        self.height = height
+        self.hAlign = 'CENTER'
+    
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+    
+    def draw(self):
+        self.canv.doForm(self.nome)
+
+
+class _CanvasGraficos(canvas.Canvas):
+    """Canvas que aguarda os gráficos pendentes e define seus forms ao salvar o PDF"""
+    
+    def __init__(self, *args, graficos: List[_GraficoPendente] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self._graficos = graficos
+    
+    def save(self):
+        # Usa só a API pública do Canvas: beginForm guarda o conteúdo de página
+        # pendente (se houver) e endForm o restaura, então o Canvas.save original
+        # continua responsável por fechar a última página e gravar o arquivo.
+        for grafico in self._graficos:
+            path = grafico.futuro.result()
+            # Gráfico ausente deve falhar o PDF, não gerar um espaço em branco
+            self.beginForm(grafico.nome, 0, 0, grafico.width, grafico.height)
+            self.drawImage(path, 0, 0, width=grafico.width, height=grafico.height)
+            self.endForm()
+        
+        super().save()
+
+
+def _grafico_flowable(grafico: Union[str, Future], nome: str) -> Optional[Flowable]:
+    """Cria o flowable do gráfico a partir de um caminho ou de um Future"""
+    if isinstance(grafico, Future):
+        return _GraficoPendente(grafico, nome, GRAFICO_LARGURA, GRAFICO_ALTURA)
+    if os.path.exists(grafico):
+        return Image(grafico, width=GRAFICO_LARGURA, height=GRAFICO_ALTURA)
+    return None
+
+
 def gerar_pdf(
     input_data: ProposalInput,
     calculos: Calculos,
-    grafico_geracao_path: str,
-    grafico_payback_path: str,
+    grafico_geracao_path: Union[str, Future],
+    grafico_payback_path: Union[str, Future],
     output_path: str
 ) -> str:
     """
     Gera PDF da proposta comercial
     
+    Os gráficos podem ser passados como caminho ou como Future que resolve
+    para o caminho; nesse caso todas as páginas são montadas antes e o PDF
+    só aguarda os gráficos ao gravar o arquivo.
+    
     Args:
         input_data: Dados de entrada
         calculos: Resultados dos cálculos
-        grafico_geracao_path: Caminho do gráfico de geração
-        grafico_payback_path: Caminho do gráfico de payback
+        grafico_geracao_path: Caminho (ou Future do caminho) do gráfico de geração
+        grafico_payback_path: Caminho (ou Future do caminho) do gráfico de payback
         output_path: Caminho de saída do PDF
     
     Returns:
@@ -207,8 +277,9 @@ def gerar_pdf(
     story.append(Spacer(1, 5*mm))
     
     # Adiciona gráfico de geração
-    if os.path.exists(grafico_geracao_path):
-        story.append(Image(grafico_geracao_path, width=170*mm, height=85*mm))
+    grafico_geracao = _grafico_flowable(grafico_geracao_path, 'grafico_geracao')
+    if grafico_geracao is not None:
+        story.append(grafico_geracao)
     
     story.append(Spacer(1, 10*mm))
     
@@ -241,9 +312,10 @@ def gerar_pdf(
     ))
     
     # Adiciona gráfico de payback
-    if os.path.exists(grafico_payback_path):
+    grafico_payback = _grafico_flowable(grafico_payback_path, 'grafico_payback')
+    if grafico_payback is not None:
         story.append(Spacer(1, 5*mm))
-        story.append(Image(grafico_payback_path, width=170*mm, height=85*mm))
+        story.append(grafico_payback)
     
     story.append(PageBreak())
     
@@ -277,7 +349,8 @@ def gerar_pdf(
     
     story.append(payback_table)
     
-    # Gera PDF
-    doc.build(story)
+    # Gera PDF (os gráficos pendentes só são aguardados ao salvar o arquivo)
+    pendentes = [f for f in story if isinstance(f, _GraficoPendente)]
+    doc.build(story, canvasmaker=partial(_CanvasGraficos, graficos=pendentes))
     
     return output_path
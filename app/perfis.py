@@ -0,0 +1,32 @@
+"""
+Perfis de saída do PDF (impressão, tela e celular)
+"""
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+
+class PerfilSaida(BaseModel):
+    nome: str
+    dpi: int = Field(..., description="DPI dos gráficos")
+    formato: Literal["png", "jpeg"] = Field(..., description="Formato dos gráficos")
+    qualidade_jpeg: Optional[int] = Field(None, description="Qualidade JPEG (1-95)")
+
+
+# Os gráficos têm 12x6 polegadas e ocupam ~6,7 polegadas de largura no PDF,
+# então o DPI do gráfico equivale a ~1,8x a resolução efetiva na página.
+PERFIS = {
+    # Qualidade máxima para impressão (PNG sem perdas, 1800x900)
+    "print": PerfilSaida(nome="print", dpi=150, formato="png"),
+    # Leitura em tela/e-mail (PNG sem perdas, 1200x600)
+    "screen": PerfilSaida(nome="screen", dpi=100, formato="png"),
+    # Envio por WhatsApp/celular (JPEG, 960x480)
+    "mobile": PerfilSaida(nome="mobile", dpi=80, formato="jpeg", qualidade_jpeg=70),
+}
+
+# Perfil usado quando a requisição não informa o campo 'perfil'
+PERFIL_PADRAO = "print"
+
+
+def extensao_grafico(perfil: PerfilSaida) -> str:
+    """Extensão do arquivo de gráfico do perfil"""
+    return ".jpg" if perfil.formato == "jpeg" else ".png"
@@ -0,0 +1,161 @@
+"""
+Pipeline de geração da proposta (cálculos, gráficos e PDF)
+"""
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable
+
+from app import __version__, calculos as _calculos, graficos as _graficos, pdf_generator as _pdf_generator
+from app.models import ProposalInput, Calculos
+from app.calculos import (
+    calcular_potencia_instalada,
+    calcular_geracao_mensal,
+    calcular_geracao_anual,
+    calcular_payback
+)
+from app.graficos import gerar_grafico_geracao_mensal, gerar_grafico_payback
+from app.pdf_generator import gerar_pdf
+from app.perfis import PerfilSaida, extensao_grafico
+
+# Versão do código que produz os arquivos (cálculos, gráficos e template do PDF).
+# Qualquer alteração nesses módulos muda a versão e invalida o cache de PDFs.
+VERSAO_CACHE = hashlib.sha256(b"".join(
+    Path(modulo.__file__).read_bytes() for modulo in (_calculos, _graficos, _pdf_generator)
+)).hexdigest()[:12]
+
+# Pool para renderizar os gráficos em paralelo com a montagem do PDF
+GRAFICOS_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="graficos")
+
+
+def calcular_proposta(data: ProposalInput) -> Calculos:
+    """Executa os cálculos de dimensionamento e payback da proposta"""
+    quantidade_placas = data.quantidade_placas
+    potencia_instalada = calcular_potencia_instalada(quantidade_placas)
+    geracao_mensal = calcular_geracao_mensal(quantidade_placas)
+    geracao_anual = calcular_geracao_anual(geracao_mensal)
+    investimento_total = data.valor_kit + data.valor_mao_obra
+    
+    payback_list, ano_retorno, economia_25_anos = calcular_payback(
+        geracao_anual, investimento_total
+    )
+    
+    return Calculos(
+        quantidade_placas=quantidade_placas,
+        potencia_instalada=potencia_instalada,
+        geracao_mensal=geracao_mensal,
+        geracao_anual=geracao_anual,
+        investimento_total=investimento_total,
+        payback=payback_list,
+        ano_retorno=ano_retorno,
+        economia_25_anos=economia_25_anos
+    )
+
+
+def chave_proposta(data: ProposalInput, perfil: PerfilSaida) -> str:
+    """
+    Identificador determinístico da proposta, usado como chave do cache
+    
+    Combina os dados de entrada, as configurações do perfil de saída e a
+    versão do código, para que alterações em qualquer um deles gerem novos
+    arquivos em vez de reaproveitar PDFs antigos.
+    """
+    dados = data.model_dump_json(exclude={"perfil"})
+    chave = f"{__version__}:{VERSAO_CACHE}:{perfil.model_dump_json()}:{dados}"
+    return hashlib.sha256(chave.encode()).hexdigest()[:32]
+
+
+def _caminho_temporario(path: Path) -> Path:
+    """Caminho temporário único ao lado do arquivo final (mantém a extensão)"""
+    return path.with_name(f".{path.stem}.{uuid.uuid4().hex}{path.suffix}")
+
+
+def salvar_grafico(
+    gerar: Callable[..., bytes],
+    dados: list,
+    path: Path,
+    perfil: PerfilSaida
+) -> str:
+    """Renderiza um gráfico no formato do perfil e grava o arquivo, retornando o caminho"""
+    conteudo = gerar(dados, dpi=perfil.dpi, formato=perfil.formato, qualidade=perfil.qualidade_jpeg)
+    
+    tmp_path = _caminho_temporario(path)
+    with open(tmp_path, 'wb') as f:
+        f.write(conteudo)
+    os.replace(tmp_path, path)
+    
+    return str(path)
+
+
+def gerar_arquivos_proposta(
+    data: ProposalInput,
+    calculos: Calculos,
+    proposal_id: str,
+    output_dir: Path,
+    perfil: PerfilSaida,
+    manter_graficos: bool = True
+) -> Path:
+    """
+    Gera gráficos e PDF da proposta no perfil indicado
+    
+    Os arquivos de cada perfil são nomeados separadamente; se o PDF do
+    perfil já existir, ele é reaproveitado sem nova renderização.
+    
+    Args:
+        manter_graficos: Mantém as imagens dos gráficos ao lado do PDF
+            (False usa arquivos temporários exclusivos desta chamada e
+            remove-os depois que o PDF é gravado)
+    
+    Returns:
+        Caminho do PDF gerado
+    """
+    pdf_path = output_dir / f"{proposal_id}_{perfil.nome}_proposta.pdf"
+    if pdf_path.exists():
+        return pdf_path
+    
+    ext = extensao_grafico(perfil)
+    grafico_geracao_path = output_dir / f"{proposal_id}_{perfil.nome}_geracao{ext}"
+    grafico_payback_path = output_dir / f"{proposal_id}_{perfil.nome}_payback{ext}"
+    if not manter_graficos:
+        # Caminhos únicos: chamadas simultâneas da mesma proposta não removem
+        # os gráficos umas das outras
+        grafico_geracao_path = _caminho_temporario(grafico_geracao_path)
+        grafico_payback_path = _caminho_temporario(grafico_payback_path)
+    
+    # Gráficos em paralelo, sem bloquear o PDF
+    grafico_geracao_futuro = GRAFICOS_EXECUTOR.submit(
+        salvar_grafico, gerar_grafico_geracao_mensal, calculos.geracao_mensal,
+        grafico_geracao_path, perfil
+    )
+    grafico_payback_futuro = GRAFICOS_EXECUTOR.submit(
+        salvar_grafico, gerar_grafico_payback, calculos.payback,
+        grafico_payback_path, perfil
+    )
+    
+    # PDF monta todas as páginas e só aguarda os gráficos ao gravar o arquivo
+    tmp_path = _caminho_temporario(pdf_path)
+    try:
+        gerar_pdf(
+            input_data=data,
+            calculos=calculos,
+            grafico_geracao_path=grafico_geracao_futuro,
+            grafico_payback_path=grafico_payback_futuro,
+            output_path=str(tmp_path)
+        )
+        os.replace(tmp_path, pdf_path)
+    finally:
+        # Se o PDF falhar antes das páginas de gráficos, descarta os que ainda não começaram
+        grafico_geracao_futuro.cancel()
+        grafico_payback_futuro.cancel()
+        if tmp_path.exists():
+            tmp_path.unlink()
+        
+        if not manter_graficos:
+            # Aguarda gráficos ainda em renderização antes de remover os arquivos
+            wait([grafico_geracao_futuro, grafico_payback_futuro])
+            grafico_geracao_path.unlink(missing_ok=True)
+            grafico_payback_path.unlink(missing_ok=True)
+    
+    return pdf_path
@@ -0,0 +1,67 @@
+"""
+Benchmark dos perfis de saída: tamanho do PDF x tempo de geração
+"""
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.models import ProposalInput
+from app.perfis import PERFIS
+from app.proposta import calcular_proposta, chave_proposta, gerar_arquivos_proposta
+
+# Execuções medidas por perfil (após uma execução de aquecimento)
+REPETICOES = 5
+
+# Dados de teste (baseados no PDF original)
+test_data = {
+    "cliente": "Paroquia Santo Antônio de Pádua",
+    "consumo": 4560,
+    "quantidade_placas": 65,
+    "valor_kit": 46028.29,
+    "valor_mao_obra": 30000.00,
+    "tipo_inversor": "02 inversores fotovoltaico 20,00 kW, fabricado pela SOFAR com AFCI"
+}
+
+
+def medir_perfil(nome: str, output_dir: Path) -> dict:
+    """Gera a proposta REPETICOES vezes no perfil e retorna tamanho e tempos"""
+    tempos = []
+    tamanho = 0
+
+    for i in range(REPETICOES + 1):
+        # Cliente distinto a cada execução para não reaproveitar o cache
+        data = ProposalInput(**{**test_data, "cliente": f"{test_data['cliente']} {i}", "perfil": nome})
+
+        inicio = time.perf_counter()
+        calculos = calcular_proposta(data)
+        pdf_path = gerar_arquivos_proposta(
+            data=data,
+            calculos=calculos,
+            proposal_id=chave_proposta(data, PERFIS[nome]),
+            output_dir=output_dir,
+            perfil=PERFIS[nome]
+        )
+        duracao = time.perf_counter() - inicio
+
+        if i > 0:
+            tempos.append(duracao)
+        tamanho = pdf_path.stat().st_size
+
+    return {
+        "perfil": nome,
+        "tamanho_bytes": tamanho,
+        "tempo_medio": statistics.mean(tempos),
+        "tempo_min": min(tempos),
+    }
+
+
+if __name__ == "__main__":
+    print(f"📊 Benchmark de perfis ({REPETICOES} execuções por perfil)\n")
+    print(f"{'PERFIL':<8} {'TAMANHO':>12} {'MÉDIA (ms)':>12} {'MÍN (ms)':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in PERFIS:
+            r = medir_perfil(nome, Path(tmp))
+            print(f"{r['perfil']:<8} {r['tamanho_bytes'] / 1024:>9.1f} KB "
+                  f"{r['tempo_medio'] * 1000:>12.0f} {r['tempo_min'] * 1000:>10.0f}")